@@ -6,11 +6,14 @@ gi.require_version('Adw', '1')
 gi.require_version('Gst', '1.0')
 from gi.repository import Gtk, Adw, GLib, Gio, Gst, Gdk
 import subprocess
+import signal
 import os
-import tempfile
 from pathlib import Path
 import json
 import shutil
+import threading
+import mmap
+import struct
 import numpy as np
 import math
 import time
@@ -27,7 +30,100 @@ HELP_DIR = os.path.join(DATA_DIR, 'help', 'C')
 ICONS_DIR = os.path.join(DATA_DIR, 'icons')
 
 
+def link_or_copy(src, dst):
+    """Hard-link src to dst, falling back to a copy across filesystems
+    
+    The new file is swapped in with os.replace, so whatever was at dst
+    (which may itself be a link to a track's audio) is never written through.
+    """
+    src_stat = os.stat(src)
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        dst_stat = None
+    if dst_stat and os.path.samestat(src_stat, dst_stat):
+        return
+    
+    tmp_path = f"{dst}.part"
+    if os.path.lexists(tmp_path):
+        os.unlink(tmp_path)
+    try:
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            # On another filesystem; copy2 keeps the mtime, so a destination
+            # copied from this same file earlier still matches and is kept
+            if (dst_stat and dst_stat.st_size == src_stat.st_size
+                    and dst_stat.st_mtime_ns == src_stat.st_mtime_ns):
+                return
+            shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _wav_data_view(path):
+    """Map the sample data of an 8- or 16-bit PCM WAV file without reading it
+    
+    Returns ((nchannels, framerate), samples), where samples is a uint8 or
+    int16 array backed by a read-only mmap of the file, or None if the file
+    isn't 8- or 16-bit integer PCM. The mapping is released along with the array.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:] != b'WAVE':
+            return None
+        
+        fmt = None
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return None
+            chunk_id = chunk_header[:4]
+            chunk_size = int.from_bytes(chunk_header[4:], 'little')
+            if chunk_id == b'data':
+                break
+            if chunk_id == b'fmt ' and chunk_size >= 16:
+                body = f.read(chunk_size)
+                format_tag, nchannels, framerate, _, _, bits = struct.unpack('<HHIIHH', body[:16])
+                if format_tag == 0xFFFE and len(body) >= 26:
+                    # WAVE_FORMAT_EXTENSIBLE keeps the real format in its sub-format GUID
+                    format_tag = int.from_bytes(body[24:26], 'little')
+                fmt = (format_tag, nchannels, framerate, bits)
+                f.seek(chunk_size % 2, os.SEEK_CUR)
+            else:
+                # Chunks are padded to an even length
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+        
+        if fmt is None or fmt[0] != 1 or fmt[3] not in (8, 16) or fmt[1] == 0:
+            return None
+        _, nchannels, framerate, bits = fmt
+        # 8-bit WAV samples are unsigned, wider ones signed little-endian
+        dtype = np.dtype('u1') if bits == 8 else np.dtype('<i2')
+        
+        # An unfinished header can claim more data than the file holds
+        data_offset = f.tell()
+        data_size = min(chunk_size, os.fstat(f.fileno()).st_size - data_offset)
+        count = data_size // (dtype.itemsize * nchannels) * nchannels
+        if count == 0:
+            return (nchannels, framerate), np.empty(0, dtype=dtype)
+        
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        samples = np.frombuffer(mapping, dtype=dtype, count=count, offset=data_offset)
+    return (nchannels, framerate), samples
+
+
 class Track:
+    # Every attribute is declared here; tracks carry no per-instance __dict__
+    __slots__ = (
+        'name', 'temp_file', 'recording', 'record_process', 'playing',
+        'paused', 'muted', 'volume', 'has_recording', 'pipeline',
+        'waveform_data', 'sample_rate', 'duration', 'loop_enabled',
+        'loop_start', 'loop_end', 'trim_start', 'trim_end', 'clipboard_data',
+        'row',
+    )
+    
     def __init__(self, name, temp_file=None):
         self.name = name
         self.temp_file = temp_file
@@ -37,6 +133,7 @@ class Track:
         self.paused = False
         self.muted = False
         self.volume = 1.0  # Volume level 0.0 to 1.0
+        self.has_recording = False  # temp_file holds finished audio
         self.pipeline = None  # GStreamer pipeline for playback
         
         # Waveform and editing properties
@@ -49,6 +146,7 @@ class Track:
         self.trim_start = 0.0  # Trim start in seconds
         self.trim_end = 0.0  # Trim end in seconds (0 = no trim)
         self.clipboard_data = None  # For copy/paste operations
+        self.row = None  # TrackRow showing this track, set by the row
 
 
 # ==================== Chromatic Tuner ====================
@@ -157,7 +255,7 @@ class WaveformView(Gtk.DrawingArea):
     
     def load_waveform(self):
         """Load waveform data from the track's audio file"""
-        if not self.track.temp_file or not os.path.exists(self.track.temp_file):
+        if not self.track.has_recording:
             self.track.waveform_data = None
             return
         
@@ -459,7 +557,7 @@ class WaveformView(Gtk.DrawingArea):
         if self.selection_start is None or self.selection_end is None:
             return False
         
-        if not self.track.temp_file or not os.path.exists(self.track.temp_file):
+        if not self.track.has_recording:
             return False
         
         try:
@@ -503,7 +601,7 @@ class WaveformView(Gtk.DrawingArea):
         if self.selection_start is None or self.selection_end is None:
             return False
         
-        if not self.track.temp_file or not os.path.exists(self.track.temp_file):
+        if not self.track.has_recording:
             return False
         
         try:
@@ -530,11 +628,7 @@ class WaveformView(Gtk.DrawingArea):
             new_frames = all_frames[:start_bytes] + all_frames[end_bytes:]
             
             # Write back
-            with wave.open(self.track.temp_file, 'wb') as wf:
-                wf.setnchannels(n_channels)
-                wf.setsampwidth(sample_width)
-                wf.setframerate(sample_rate)
-                wf.writeframes(new_frames)
+            self._replace_audio(n_channels, sample_width, sample_rate, new_frames)
             
             # Update track duration
             self.track.duration -= (sel_end - sel_start)
@@ -554,7 +648,7 @@ class WaveformView(Gtk.DrawingArea):
         if not self.track.clipboard_data:
             return False
         
-        if not self.track.temp_file or not os.path.exists(self.track.temp_file):
+        if not self.track.has_recording:
             return False
         
         if position is None:
@@ -588,11 +682,7 @@ class WaveformView(Gtk.DrawingArea):
             new_frames = all_frames[:insert_bytes] + clipboard['frames'] + all_frames[insert_bytes:]
             
             # Write back
-            with wave.open(self.track.temp_file, 'wb') as wf:
-                wf.setnchannels(n_channels)
-                wf.setsampwidth(sample_width)
-                wf.setframerate(sample_rate)
-                wf.writeframes(new_frames)
+            self._replace_audio(n_channels, sample_width, sample_rate, new_frames)
             
             # Update track duration
             self.track.duration += clipboard['duration']
@@ -604,6 +694,25 @@ class WaveformView(Gtk.DrawingArea):
         except Exception as e:
             print(f"Error pasting: {e}")
             return False
+    
+    def _replace_audio(self, n_channels, sample_width, sample_rate, frames):
+        """Write edited audio to a new file and swap it in for the track's file
+        
+        The track's file may be hard-linked into a saved project or an export,
+        so it must never be rewritten in place.
+        """
+        import wave
+        tmp_path = f"{self.track.temp_file}.part"
+        try:
+            with wave.open(tmp_path, 'wb') as wf:
+                wf.setnchannels(n_channels)
+                wf.setsampwidth(sample_width)
+                wf.setframerate(sample_rate)
+                wf.writeframes(frames)
+            os.replace(tmp_path, self.track.temp_file)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
 
 
 class DrumGrid(Gtk.DrawingArea):
@@ -1658,6 +1767,11 @@ class TunerDialog(Adw.Dialog):
         self.audio_buffer = np.array([], dtype=np.float32)
         self.buffer_target_size = 16384
         
+        # Window and FFT size for the last analysed length; once the buffer
+        # is full every call uses the same length, so they're built once
+        self._window = None
+        self._fft_size = 0
+        
         # Smoothing for stable display
         self.freq_history = []
         self.history_size = 8  # More smoothing for low frequencies
@@ -1802,8 +1916,13 @@ class TunerDialog(Adw.Dialog):
         audio_data = audio_data - np.mean(audio_data)
         
         # Apply window function
-        window = np.hanning(len(audio_data))
-        audio_data = audio_data * window
+        n = len(audio_data)
+        if self._window is None or len(self._window) != n:
+            # float32 like the samples, so windowing doesn't promote them; on
+            # NumPy 2 this also keeps the FFTs below in single precision
+            self._window = np.hanning(n).astype(np.float32)
+            self._fft_size = 1 << (2 * n - 1).bit_length()  # Next power of 2
+        audio_data = audio_data * self._window
         
         # Frequency range for bass and guitar
         # B0 = 30.87 Hz (6-string bass low B) -> period = 1555 samples at 48kHz
@@ -1823,13 +1942,11 @@ class TunerDialog(Adw.Dialog):
             return 0
         
         # Autocorrelation method (more reliable than YIN for low frequencies)
-        # Compute normalized autocorrelation
-        n = len(audio_data)
-        
-        # Use FFT for faster autocorrelation
-        fft_size = 1 << (2 * n - 1).bit_length()  # Next power of 2
-        fft = np.fft.rfft(audio_data, fft_size)
-        autocorr = np.fft.irfft(fft * np.conj(fft))[:n]
+        # Compute normalized autocorrelation, using FFT for speed
+        fft = np.fft.rfft(audio_data, self._fft_size)
+        # The power spectrum is real, so skip the complex conjugate product
+        power = fft.real * fft.real + fft.imag * fft.imag
+        autocorr = np.fft.irfft(power, self._fft_size)[:n]
         
         # Normalize by the zero-lag value
         if autocorr[0] > 0:
@@ -1916,13 +2033,18 @@ class AudioRecorderApp(Adw.Application):
     def __init__(self):
         super().__init__(application_id='org.gnome.AudioRecorder')
         self.monitoring = False
-        self.monitor_process = None
+        self.monitor_process = None  # pid of the running pw-loopback
         self.tracks = []
         self.next_track_number = 1
         self.project_file = None
         self.project_dirty = False
         self.config_dir = self._get_config_dir()
         self.config_file = os.path.join(self.config_dir, 'config.json')
+        self._config = None  # loaded lazily by _load_config
+        # Recordings for this run live here until they're saved into a project
+        self.session_dir = os.path.join(GLib.get_user_cache_dir(), 'audio-recorder', str(os.getpid()))
+        self.next_session_file = 1
+        self._sweep_session_dirs()
     
     def _get_config_dir(self):
         """Get the application config directory (XDG compliant)"""
@@ -1931,31 +2053,71 @@ class AudioRecorderApp(Adw.Application):
         os.makedirs(config_dir, exist_ok=True)
         return config_dir
     
+    def _sweep_session_dirs(self):
+        """Remove session directories left behind by runs that didn't shut down cleanly"""
+        # Only do_shutdown removes a session directory, so a crash or a killed
+        # session leaves its recordings in the cache. Our own pid's directory
+        # can only be stale, from an earlier process that had the same pid.
+        try:
+            entries = list(os.scandir(os.path.dirname(self.session_dir)))
+        except OSError:
+            return
+        for entry in entries:
+            if not entry.name.isdigit() or not entry.is_dir(follow_symlinks=False):
+                continue
+            if entry.path != self.session_dir:
+                try:
+                    os.kill(int(entry.name), 0)
+                    continue
+                except ProcessLookupError:
+                    pass
+                except OSError:
+                    # Alive, but owned by someone else
+                    continue
+            shutil.rmtree(entry.path, ignore_errors=True)
+    
+    def new_session_file(self):
+        """Get a fresh path for track audio inside the session directory"""
+        os.makedirs(self.session_dir, exist_ok=True)
+        path = os.path.join(self.session_dir, f"track-{self.next_session_file}.wav")
+        self.next_session_file += 1
+        return path
+    
+    def _load_config(self):
+        """Read the config file on first use and keep it in memory"""
+        if self._config is None:
+            self._config = {}
+            try:
+                if os.path.exists(self.config_file):
+                    with open(self.config_file, 'r') as f:
+                        config = json.load(f)
+                    if isinstance(config, dict):
+                        self._config = config
+            except Exception:
+                pass
+        return self._config
+    
     def get_recent_project(self):
         """Get the most recent project path from config"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    recent = config.get('recent_project')
-                    if recent and os.path.exists(recent):
-                        return recent
-        except Exception:
-            pass
+        recent = self._load_config().get('recent_project')
+        if recent and os.path.exists(recent):
+            return recent
         return None
     
     def set_recent_project(self, project_path):
         """Save the most recent project path to config"""
+        config = self._load_config()
+        if config.get('recent_project') == project_path:
+            return
+        config['recent_project'] = project_path
+        tmp_path = f"{self.config_file}.part"
         try:
-            config = {}
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-            config['recent_project'] = project_path
-            with open(self.config_file, 'w') as f:
+            with open(tmp_path, 'w') as f:
                 json.dump(config, f, indent=2)
+            os.replace(tmp_path, self.config_file)
         except Exception:
-            pass
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
         
     def do_activate(self):
         # Register custom icon path for tuning fork icon
@@ -1966,6 +2128,10 @@ class AudioRecorderApp(Adw.Application):
         self.setup_accelerators()
         win.present()
     
+    def do_shutdown(self):
+        shutil.rmtree(self.session_dir, ignore_errors=True)
+        Adw.Application.do_shutdown(self)
+    
     def setup_accelerators(self):
         """Set up keyboard shortcuts for all actions"""
         self.set_accels_for_action("win.new_project", ["<Control>n"])
@@ -2015,10 +2181,15 @@ class TrackRow(Gtk.ListBoxRow):
         super().__init__()
         self.track = track
         self.window = window
+        track.row = self
         
         self.track_label.set_text(track.name)
         self.status_label.set_text("Ready")
         
+        # Last state shown, so repeated updates don't restyle the row
+        self._recording_state = False
+        self._playing_state = (False, False)
+        
         # Set initial volume and tooltip
         vol_percent = int(track.volume * 100)
         self.volume_scale.set_value(vol_percent)
@@ -2039,9 +2210,9 @@ class TrackRow(Gtk.ListBoxRow):
         self.delete_btn.connect("clicked", self.on_delete_clicked)
         
         # Waveform control signals
-        self.zoom_in_btn.connect("clicked", lambda b: self.waveform_view.zoom_in())
-        self.zoom_out_btn.connect("clicked", lambda b: self.waveform_view.zoom_out())
-        self.zoom_fit_btn.connect("clicked", lambda b: self.waveform_view.zoom_fit())
+        self.zoom_in_btn.connect("clicked", self.on_zoom_in_clicked)
+        self.zoom_out_btn.connect("clicked", self.on_zoom_out_clicked)
+        self.zoom_fit_btn.connect("clicked", self.on_zoom_fit_clicked)
         self.loop_selection_btn.connect("clicked", self.on_loop_selection_clicked)
         self.trim_btn.connect("clicked", self.on_trim_clicked)
         self.copy_btn.connect("clicked", self.on_copy_clicked)
@@ -2049,7 +2220,7 @@ class TrackRow(Gtk.ListBoxRow):
         self.delete_selection_btn.connect("clicked", self.on_delete_selection_clicked)
         
         # Load waveform if track has audio
-        if track.temp_file and os.path.exists(track.temp_file):
+        if track.has_recording:
             GLib.idle_add(self.waveform_view.load_waveform)
     
     def on_edit_clicked(self, button):
@@ -2083,6 +2254,15 @@ class TrackRow(Gtk.ListBoxRow):
                 self.track.loop_end = self.track.duration
         self.waveform_view.queue_draw()
     
+    def on_zoom_in_clicked(self, button):
+        self.waveform_view.zoom_in()
+    
+    def on_zoom_out_clicked(self, button):
+        self.waveform_view.zoom_out()
+    
+    def on_zoom_fit_clicked(self, button):
+        self.waveform_view.zoom_fit()
+    
     def on_loop_selection_clicked(self, button):
         """Set loop region from current selection"""
         self.waveform_view.set_loop_from_selection()
@@ -2116,7 +2296,7 @@ class TrackRow(Gtk.ListBoxRow):
     
     def update_waveform_controls(self):
         """Update waveform control button sensitivity"""
-        has_audio = self.track.temp_file and os.path.exists(self.track.temp_file)
+        has_audio = self.track.has_recording
         has_selection = (self.waveform_view.selection_start is not None and 
                         self.waveform_view.selection_end is not None)
         has_clipboard = self.track.clipboard_data is not None
@@ -2129,6 +2309,10 @@ class TrackRow(Gtk.ListBoxRow):
         self.delete_selection_btn.set_sensitive(has_audio and has_selection)
     
     def set_recording(self, recording):
+        if recording == self._recording_state:
+            return
+        self._recording_state = recording
+        
         self.record_btn.set_sensitive(not recording)
         self.stop_btn.set_sensitive(recording)
         self.play_btn.set_sensitive(False)
@@ -2138,13 +2322,17 @@ class TrackRow(Gtk.ListBoxRow):
         else:
             self.status_label.set_text("Stopped")
             self.remove_css_class("error")
-            if self.track.temp_file and os.path.exists(self.track.temp_file):
+            if self.track.has_recording:
                 self.play_btn.set_sensitive(True)
                 # Reload waveform after recording
                 GLib.idle_add(self.waveform_view.load_waveform)
                 self.update_waveform_controls()
     
     def set_playing(self, playing, paused=False):
+        if (playing, paused) == self._playing_state:
+            return
+        self._playing_state = (playing, paused)
+        
         if playing:
             self.play_btn.set_icon_name("media-playback-pause-symbolic")
             self.status_label.set_text("Playing…" if not self.track.muted else "Playing (muted)…")
@@ -2169,6 +2357,39 @@ class TrackRow(Gtk.ListBoxRow):
             self.status_label.set_text("Paused (muted)" if muted else "Paused")
 
 
+# Groups shown in the keyboard shortcuts window
+SHORTCUT_GROUPS = (
+    ("Project", (
+        ("New Project", "<Control>n"),
+        ("Open Project", "<Control>o"),
+        ("Save Project", "<Control>s"),
+        ("Save Project As", "<Control><Shift>s"),
+    )),
+    ("Tracks", (
+        ("Add Track", "<Control>t"),
+        ("Import Audio", "<Control>i"),
+    )),
+    ("Playback", (
+        ("Play / Pause All", "<Control>space"),
+        ("Stop All", "<Control>period"),
+        ("Toggle Monitoring", "<Control>l"),
+    )),
+    ("Tools", (
+        ("Chromatic Tuner", "<Control>u"),
+        ("Drum Machine", "<Control>d"),
+    )),
+    ("Export", (
+        ("Export Tracks", "<Control><Shift>t"),
+        ("Export Mixed", "<Control><Shift>x"),
+        ("Export All", "<Control><Shift>a"),
+    )),
+    ("Help", (
+        ("Help", "F1"),
+        ("Keyboard Shortcuts", "<Control>question"),
+    )),
+)
+
+
 @Gtk.Template(filename=os.path.join(UI_DIR, 'window.ui'))
 class AudioRecorderWindow(Adw.ApplicationWindow):
     __gtype_name__ = 'AudioRecorderWindow'
@@ -2192,10 +2413,23 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         self.maximize()
         
         self.playing_tracks = set()
-        self.monitor_latency = '64'
+        self.paused_tracks = set()
+        self._shortcuts_window = None  # built on first use by on_show_shortcuts
+        self._pending_errors = []  # messages waiting for _flush_error_dialog
+        self._buttons_refresh_pending = False  # see update_global_playback_buttons
+        self.mixing = False
+        self._mix_thread = None  # worker thread of the running export, if any
+        self._close_after_mix = False  # close was requested during an export
+        self._export_enabled = False  # export actions start out disabled
+        self._mix_acc = None  # int32 accumulator reused across mixes
+        # Small buffers shrink PipeWire's graph quantum for every other client
+        # too, so start large and leave lower latencies as an opt-in
+        self.monitor_latency = '1024'
         self.drum_machine_panel = None
         self.drum_machine_visible = False
         self._pending_drum_machine_state = None
+        self.pending_callback = None  # action to run once a Save As finishes
+        self.pending_close = False  # Save As was started by closing the window
         
         # Hide drum machine container initially
         self.drum_machine_container.set_visible(False)
@@ -2211,6 +2445,15 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         # Create actions
         self.create_actions()
         
+        # Monitoring needs pw-loopback; look it up once instead of failing on
+        # every toggle. os.posix_spawn needs the full path, as it doesn't
+        # search PATH.
+        self.pw_loopback = shutil.which('pw-loopback')
+        if self.pw_loopback is None:
+            self.monitor_toggle.set_sensitive(False)
+            self.monitor_toggle.set_tooltip_text("PipeWire tools not installed")
+            self.lookup_action("toggle_monitoring").set_enabled(False)
+        
         # Load recent project or create new
         self.load_recent_or_new_project()
         
@@ -2327,21 +2570,37 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
             file = dialog.save_finish(result)
             if file:
                 self.save_project(file.get_path())
-                if hasattr(self, 'pending_callback'):
-                    self.pending_callback()
-                    delattr(self, 'pending_callback')
+                if self.pending_callback:
+                    callback = self.pending_callback
+                    self.pending_callback = None
+                    callback()
         except Exception as e:
             if "dismissed" not in str(e).lower():
                 self.show_error_dialog(f"Failed to save project: {str(e)}")
     
-    def create_new_project(self):
+    def _clear_all_tracks(self):
+        """Stop and drop every track in one pass, leaving an empty track list"""
         app = self.get_application()
         
-        while self.track_list.get_first_child():
-            row = self.track_list.get_first_child()
-            self.on_track_delete(row)
+        for track in app.tracks:
+            if track.recording and track.record_process:
+                track.record_process.send_signal(signal.SIGTERM)
+                track.record_process = None
+                track.recording = False
+            self._release_pipeline(track)
+            if track.temp_file and os.path.exists(track.temp_file):
+                os.unlink(track.temp_file)
         
         app.tracks = []
+        self.playing_tracks.clear()
+        self.paused_tracks.clear()
+        self.track_list.remove_all()
+        self.update_export_buttons()
+    
+    def create_new_project(self):
+        app = self.get_application()
+        
+        self._clear_all_tracks()
         app.next_track_number = 1
         app.project_file = None
         app.project_dirty = False
@@ -2392,11 +2651,7 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
             with open(project_path, 'r') as f:
                 project_data = json.load(f)
             
-            while self.track_list.get_first_child():
-                row = self.track_list.get_first_child()
-                self.on_track_delete(row)
-            
-            app.tracks = []
+            self._clear_all_tracks()
             app.project_file = project_path
             project_dir = os.path.dirname(project_path)
             
@@ -2405,9 +2660,11 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
                 
                 audio_file = os.path.join(project_dir, track_data['audio_file'])
                 if os.path.exists(audio_file):
-                    fd, track.temp_file = tempfile.mkstemp(suffix='.wav')
-                    os.close(fd)
-                    shutil.copy2(audio_file, track.temp_file)
+                    # Edits and re-recordings replace the session file rather than
+                    # writing through it, so linking leaves the project untouched
+                    track.temp_file = app.new_session_file()
+                    link_or_copy(audio_file, track.temp_file)
+                    track.has_recording = True
                 
                 # Restore volume and muted state
                 track.volume = track_data.get('volume', 1.0)
@@ -2487,18 +2744,22 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
             os.makedirs(project_dir, exist_ok=True)
             os.makedirs(audio_dir, exist_ok=True)
             
-            if os.path.exists(audio_dir):
-                for old_file in os.listdir(audio_dir):
-                    old_file_path = os.path.join(audio_dir, old_file)
-                    if os.path.isfile(old_file_path):
-                        os.unlink(old_file_path)
+            # Only remove files that no longer belong to a track. The rest are
+            # usually links to the session files already, and link_or_copy
+            # leaves those alone, so saving skips tracks that haven't changed.
+            keep = {f"{track.name}.wav" for track in app.tracks if track.has_recording}
+            # scandir gets file types from the directory listing itself
+            with os.scandir(audio_dir) as entries:
+                stale = [entry.path for entry in entries if entry.name not in keep and entry.is_file()]
+            for old_file_path in stale:
+                os.unlink(old_file_path)
             
             tracks_data = []
             for track in app.tracks:
-                if track.temp_file and os.path.exists(track.temp_file):
+                if track.has_recording:
                     audio_filename = f"{track.name}.wav"
                     audio_path = os.path.join(audio_dir, audio_filename)
-                    shutil.copy2(track.temp_file, audio_path)
+                    link_or_copy(track.temp_file, audio_path)
                     
                     tracks_data.append({
                         'name': track.name,
@@ -2516,8 +2777,16 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
             if self.drum_machine_panel is not None:
                 project_data['drum_machine'] = self.drum_machine_panel.get_state()
             
-            with open(project_file, 'w') as f:
-                json.dump(project_data, f, indent=2)
+            # Write beside the target and rename so a crash mid-write
+            # never leaves a truncated project file behind
+            tmp_path = f"{project_file}.part"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(project_data, f, indent=2)
+                os.replace(tmp_path, project_file)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
             
             app.project_file = project_file
             app.project_dirty = False
@@ -2560,9 +2829,9 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
             track_name = os.path.splitext(os.path.basename(audio_path))[0]
             track = Track(track_name)
             
-            fd, track.temp_file = tempfile.mkstemp(suffix='.wav')
-            os.close(fd)
-            shutil.copy2(audio_path, track.temp_file)
+            track.temp_file = app.new_session_file()
+            link_or_copy(audio_path, track.temp_file)
+            track.has_recording = True
             
             app.tracks.append(track)
             
@@ -2589,13 +2858,14 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
                 app = self.get_application()
                 folder_path = folder.get_path()
                 
+                exports = []
                 for track in app.tracks:
-                    if track.temp_file and os.path.exists(track.temp_file):
+                    if track.has_recording:
                         filename = f"{track.name}.wav"
-                        destination = os.path.join(folder_path, filename)
-                        shutil.copy2(track.temp_file, destination)
+                        exports.append((track.temp_file, os.path.join(folder_path, filename)))
                 
-                self.status_label.set_label(f"Exported {len(app.tracks)} tracks")
+                # Copies across filesystems can take a while, so don't block the UI on them
+                self.start_mix(None, f"Exported {len(exports)} tracks", exports)
         except Exception as e:
             if "dismissed" not in str(e).lower():
                 self.show_error_dialog(f"Failed to export: {str(e)}")
@@ -2610,8 +2880,7 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         try:
             file = dialog.save_finish(result)
             if file:
-                self.mix_tracks(file.get_path())
-                self.status_label.set_label("Exported mixed track")
+                self.start_mix(file.get_path(), "Exported mixed track")
         except Exception as e:
             if "dismissed" not in str(e).lower():
                 self.show_error_dialog(f"Failed to export: {str(e)}")
@@ -2628,94 +2897,220 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
                 app = self.get_application()
                 folder_path = folder.get_path()
                 
+                exports = []
                 for track in app.tracks:
-                    if track.temp_file and os.path.exists(track.temp_file):
+                    if track.has_recording:
                         filename = f"{track.name}.wav"
-                        destination = os.path.join(folder_path, filename)
-                        shutil.copy2(track.temp_file, destination)
+                        exports.append((track.temp_file, os.path.join(folder_path, filename)))
                 
                 mixed_path = os.path.join(folder_path, "mixed.wav")
-                self.mix_tracks(mixed_path)
-                
-                self.status_label.set_label("Exported all tracks and mix")
+                self.start_mix(mixed_path, "Exported all tracks and mix", exports)
         except Exception as e:
             if "dismissed" not in str(e).lower():
                 self.show_error_dialog(f"Failed to export: {str(e)}")
     
-    def mix_tracks(self, output_path):
-        """Mix all tracks using GStreamer audiomixer for proper audio quality"""
+    def start_mix(self, output_path, done_message, exports=()):
+        """Mix all tracks on a worker thread so the UI stays responsive
+        
+        exports is a list of (track file, destination) pairs to write out on
+        the same thread before mixing. With no output_path, only the exports
+        are written.
+        """
         app = self.get_application()
         
-        valid_tracks = [t for t in app.tracks if t.temp_file and os.path.exists(t.temp_file)]
-        if not valid_tracks:
+        audio_files = [t.temp_file for t in app.tracks if t.has_recording]
+        if not audio_files:
+            self.status_label.set_label("No recorded tracks to export")
             return
         
-        # Build GStreamer pipeline for mixing
-        # Pipeline: filesrc ! decodebin ! audioconvert ! audiomixer ! audioconvert ! wavenc ! filesink
+        # Hard-link every input into the session directory first. Deleting,
+        # re-recording or editing a track replaces its file rather than
+        # writing it, so the worker keeps reading the takes as they are now.
+        snapshots = {}
+        try:
+            for src in set(audio_files).union(src for src, dst in exports):
+                snapshots[src] = app.new_session_file()
+                link_or_copy(src, snapshots[src])
+        except OSError as e:
+            for path in snapshots.values():
+                if os.path.exists(path):
+                    os.unlink(path)
+            self.show_error_dialog(f"Failed to export: {str(e)}")
+            return
+        audio_files = [snapshots[src] for src in audio_files]
+        exports = [(snapshots[src], dst) for src, dst in exports]
         
-        pipeline = Gst.Pipeline.new("mixer")
-        mixer = Gst.ElementFactory.make("audiomixer", "mixer")
-        audioconvert = Gst.ElementFactory.make("audioconvert", "convert")
-        wavenc = Gst.ElementFactory.make("wavenc", "encoder")
-        filesink = Gst.ElementFactory.make("filesink", "sink")
+        # Keep the export actions disabled until this mix has finished
+        self.mixing = True
+        self.update_export_buttons()
+        self.status_label.set_label("Mixing…" if output_path else "Exporting…")
         
-        if not all([mixer, audioconvert, wavenc, filesink]):
-            self.show_error_dialog("Failed to create GStreamer elements for mixing")
-            return
+        self._mix_thread = threading.Thread(target=self._mix_worker, args=(audio_files, output_path, done_message, exports, list(snapshots.values())), daemon=True)
+        self._mix_thread.start()
+    
+    def _mix_worker(self, audio_files, output_path, done_message, exports, snapshots):
+        """Run mix_tracks off the main thread and report back via the main loop"""
+        try:
+            # If a link has to fall back to copying, the copy leaves the track
+            # in the page cache, so the mix right after doesn't read it from disk again
+            for src, dst in exports:
+                link_or_copy(src, dst)
+            if output_path:
+                self.mix_tracks(audio_files, output_path)
+        except Exception as e:
+            result = (None, str(e))
+        else:
+            result = (done_message, None)
         
-        filesink.set_property("location", output_path)
+        for path in snapshots:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        GLib.idle_add(self._on_mix_finished, *result)
+    
+    def _on_mix_finished(self, done_message, error):
+        """Re-enable exporting once a background mix completes"""
+        self.mixing = False
+        self._mix_thread.join()
+        self._mix_thread = None
+        self.update_export_buttons()
+        if error:
+            self.show_error_dialog(f"Failed to export: {error}")
+        else:
+            self.status_label.set_label(done_message)
+        # After a failure, stay open so the error can be read
+        if self._close_after_mix:
+            self._close_after_mix = False
+            if not error:
+                self.close()
+        return False
+    
+    def mix_tracks(self, audio_files, output_path):
+        """Mix audio files, using NumPy for 8/16-bit PCM and GStreamer audiomixer otherwise
         
-        pipeline.add(mixer)
-        pipeline.add(audioconvert)
-        pipeline.add(wavenc)
-        pipeline.add(filesink)
+        Doesn't touch any widgets, so it's safe to call from a worker thread.
+        """
+        if len(audio_files) == 1:
+            # Mixing a single track gives back the same samples
+            link_or_copy(audio_files[0], output_path)
+            return
         
-        mixer.link(audioconvert)
-        audioconvert.link(wavenc)
-        wavenc.link(filesink)
+        # Write next to the destination and swap the result in, so an existing
+        # file there (possibly a link to a track's audio) is never written through
+        tmp_path = f"{output_path}.part"
+        try:
+            # Recordings are 16-bit PCM, so the common case never needs a decoder
+            if not self._mix_pcm(audio_files, tmp_path):
+                self._mix_gstreamer(audio_files, tmp_path)
+            os.replace(tmp_path, output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def _mix_pcm(self, audio_files, output_path):
+        """Mix 8/16-bit PCM tracks sharing one layout directly with NumPy
+        
+        Samples are summed and saturated to the int16 range, matching what
+        audiomixer does. Tracks are streamed in fixed-size chunks so memory
+        use doesn't grow with the length of the session. Returns False
+        without writing anything when the tracks would need decoding or
+        format conversion.
+        """
+        import wave
+        
+        chunk_frames = 8192
+        params = None
+        tracks = []
+        for audio_file in audio_files:
+            # Track files are never rewritten in place, so the mapping stays
+            # valid even if a track is re-recorded or edited mid-mix
+            view = _wav_data_view(audio_file)
+            if view is None:
+                # e.g. 32-bit float WAVs, which need converting first
+                return False
+            track_params, samples = view
+            if params is None:
+                params = track_params
+            elif track_params != params:
+                return False
+            tracks.append(samples)
+        nchannels, framerate = params
+        
+        # Chunks are small next to the write buffer, so the disk sees few large writes
+        with open(output_path, 'wb', buffering=1 << 20) as f, wave.open(f, 'wb') as out:
+            out.setnchannels(nchannels)
+            out.setsampwidth(2)
+            out.setframerate(framerate)
+            
+            # Accumulate in int32 so the sum can't wrap before clipping.
+            # Only one mix runs at a time, so the buffer can be shared.
+            # Samples stay interleaved exactly as WAV stores them: every track
+            # has the same channel count, so summing flat arrays mixes channel
+            # with channel. Anything that works per channel (gain, pan) should
+            # reshape a view with acc.reshape(-1, nchannels) at that point
+            # rather than deinterleave the whole buffer.
+            acc_size = chunk_frames * nchannels
+            if self._mix_acc is None or self._mix_acc.size < acc_size:
+                self._mix_acc = np.empty(acc_size, dtype=np.int32)
+            acc = self._mix_acc[:acc_size]
+            mixed = np.empty(acc_size, dtype=np.int16)
+            
+            total = max(samples.size for samples in tracks)
+            for start in range(0, total, acc_size):
+                used = min(acc_size, total - start)
+                acc.fill(0)
+                for samples in tracks:
+                    # Slicing the mapped data reads straight from the page cache
+                    chunk = samples[start:start + acc_size]
+                    if chunk.dtype == np.uint8:
+                        # Centre unsigned 8-bit samples on zero and scale them to 16 bits
+                        chunk = (chunk.astype(np.int32) - 128) << 8
+                    acc[:chunk.size] += chunk
+                # Saturate in place and narrow into a reused buffer, so each
+                # chunk costs no temporary arrays
+                np.clip(acc[:used], -32768, 32767, out=acc[:used])
+                np.copyto(mixed[:used], acc[:used], casting='unsafe')
+                # writeframesraw takes any buffer, so hand it the array without a
+                # bytes copy. Unlike writeframes it doesn't seek back to patch the
+                # header after every chunk; that happens once on close.
+                out.writeframesraw(mixed[:used])
+        return True
+    
+    def _mix_gstreamer(self, audio_files, output_path):
+        """Mix WAV tracks of any sample format or rate using GStreamer audiomixer"""
+        # Build GStreamer pipeline for mixing
+        # Pipeline: filesrc ! wavparse ! audioconvert ! audiomixer ! audioconvert ! wavenc ! filesink
+        # Every track is a WAV file (recordings, and imports are limited to
+        # *.wav), so wavparse replaces decodebin's type-finding. parse_launch
+        # links its source pad once the header has been read.
+        # Locations are set as properties so paths never need quoting.
+        branches = " ".join(
+            f"filesrc name=source{i} ! wavparse ! audioconvert ! audioresample ! mixer."
+            for i in range(len(audio_files))
+        )
+        try:
+            pipeline = Gst.parse_launch(f"audiomixer name=mixer ! audioconvert ! wavenc ! filesink name=sink {branches}")
+        except GLib.Error as e:
+            raise RuntimeError(f"Failed to create GStreamer elements for mixing: {e.message}")
         
-        # Add a source for each track
-        for i, track in enumerate(valid_tracks):
-            filesrc = Gst.ElementFactory.make("filesrc", f"source{i}")
-            decodebin = Gst.ElementFactory.make("decodebin", f"decode{i}")
-            convert = Gst.ElementFactory.make("audioconvert", f"convert{i}")
-            resample = Gst.ElementFactory.make("audioresample", f"resample{i}")
-            
-            if not all([filesrc, decodebin, convert, resample]):
-                continue
-            
-            filesrc.set_property("location", track.temp_file)
-            
-            pipeline.add(filesrc)
-            pipeline.add(decodebin)
-            pipeline.add(convert)
-            pipeline.add(resample)
-            
-            filesrc.link(decodebin)
-            convert.link(resample)
-            resample.link(mixer)
-            
-            # Connect decodebin's dynamic pad to audioconvert
-            decodebin.connect("pad-added", self._on_decode_pad_added, convert)
+        pipeline.get_by_name("sink").set_property("location", output_path)
+        for i, audio_file in enumerate(audio_files):
+            pipeline.get_by_name(f"source{i}").set_property("location", audio_file)
         
         # Run the pipeline
         pipeline.set_state(Gst.State.PLAYING)
         
         # Wait for completion
         bus = pipeline.get_bus()
-        bus.timed_pop_filtered(Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS | Gst.MessageType.ERROR)
+        msg = bus.timed_pop_filtered(Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS | Gst.MessageType.ERROR)
         
         pipeline.set_state(Gst.State.NULL)
-    
-    def _on_decode_pad_added(self, decodebin, pad, audioconvert):
-        """Handle dynamic pad from decodebin"""
-        caps = pad.get_current_caps()
-        if caps:
-            struct = caps.get_structure(0)
-            if struct.get_name().startswith("audio"):
-                sink_pad = audioconvert.get_static_pad("sink")
-                if not sink_pad.is_linked():
-                    pad.link(sink_pad)
+        
+        # Let the caller report the failure instead of claiming a successful export
+        if msg and msg.type == Gst.MessageType.ERROR:
+            err, _ = msg.parse_error()
+            raise RuntimeError(err.message)
     
     # ==================== Track Management ====================
     
@@ -2742,40 +3137,81 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         self.add_track()
     
     def on_track_record(self, row):
+        app = self.get_application()
         track = row.track
         
-        fd, track.temp_file = tempfile.mkstemp(suffix='.wav')
-        os.close(fd)
+        # Record straight into the session directory, reusing the track's path
+        # when re-recording. Unlink first so hard links to the old take survive.
+        if track.temp_file:
+            if os.path.exists(track.temp_file):
+                os.unlink(track.temp_file)
+        else:
+            track.temp_file = app.new_session_file()
+        track.has_recording = False
+        self.update_export_buttons()
         
         try:
-            track.record_process = subprocess.Popen([
-                'pw-record', '--target', 'auto', track.temp_file
-            ])
+            track.record_process = Gio.Subprocess.new([
+                'pw-record', '--target', 'auto', '--latency', '1024',
+                '--format', 's16', '--rate', '48000', '--channels', '2',
+                track.temp_file
+            ], Gio.SubprocessFlags.STDOUT_SILENCE)
             track.recording = True
             row.set_recording(True)
-        except FileNotFoundError:
-            self.show_error_dialog("PipeWire tools not found. Please install pipewire-utils package.")
-            if track.temp_file:
+        except GLib.Error as e:
+            if e.matches(GLib.spawn_error_quark(), GLib.SpawnError.NOENT):
+                self.show_error_dialog("PipeWire tools not found. Please install pipewire-utils package.")
+            else:
+                self.show_error_dialog(f"Failed to start recording: {e.message}")
+            # pw-record never ran, so there is usually no file to remove
+            if track.temp_file and os.path.exists(track.temp_file):
                 os.unlink(track.temp_file)
-                track.temp_file = None
+            track.temp_file = None
+            track.has_recording = False
         except Exception as e:
             self.show_error_dialog(f"Failed to start recording: {str(e)}")
-            if track.temp_file:
+            # pw-record never ran, so there is usually no file to remove
+            if track.temp_file and os.path.exists(track.temp_file):
                 os.unlink(track.temp_file)
-                track.temp_file = None
+            track.temp_file = None
+            track.has_recording = False
     
     def on_track_stop(self, row):
         track = row.track
         
         if track.recording and track.record_process:
-            track.record_process.terminate()
-            track.record_process.wait()
-            track.record_process = None
-            track.recording = False
-            row.set_recording(False)
-            self.update_export_buttons()
-            app = self.get_application()
-            app.project_dirty = True
+            # pw-record finishes the WAV header on SIGTERM; let the main loop
+            # pick up its exit instead of blocking the UI until then
+            row.stop_btn.set_sensitive(False)
+            track.record_process.send_signal(signal.SIGTERM)
+            track.record_process.wait_async(None, self.on_record_finished, row)
+    
+    def on_record_finished(self, process, result, row):
+        track = row.track
+        
+        try:
+            process.wait_finish(result)
+        except GLib.Error:
+            pass
+        
+        # The track may have been deleted while pw-record was exiting
+        if track.record_process is not process:
+            return
+        
+        track.record_process = None
+        track.recording = False
+        # pw-record may have exited early (no PipeWire, no usable target)
+        # without writing anything
+        track.has_recording = os.path.exists(track.temp_file)
+        row.set_recording(False)
+        
+        if not track.has_recording:
+            self.show_error_dialog("Recording failed: pw-record did not write any audio")
+            return
+        
+        self.update_export_buttons()
+        app = self.get_application()
+        app.project_dirty = True
     
     def on_track_play(self, row):
         track = row.track
@@ -2787,6 +3223,7 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
             track.paused = True
             row.set_playing(False, paused=True)
             self.playing_tracks.discard(row)
+            self.paused_tracks.add(row)
         elif track.paused:
             if track.pipeline:
                 track.pipeline.set_state(Gst.State.PLAYING)
@@ -2794,29 +3231,16 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
             track.paused = False
             row.set_playing(True)
             self.playing_tracks.add(row)
-            
-            if len(self.playing_tracks) == 1:
-                GLib.timeout_add(100, self.check_playback_finished)
+            self.paused_tracks.discard(row)
         else:
-            if track.temp_file and os.path.exists(track.temp_file):
+            if track.has_recording:
                 try:
-                    track.pipeline = Gst.ElementFactory.make("playbin", f"playbin-{track.name}")
-                    track.pipeline.set_property("uri", f"file://{track.temp_file}")
-                    
-                    # Apply volume (0 if muted, otherwise track volume)
-                    if track.muted:
-                        track.pipeline.set_property("volume", 0.0)
-                    else:
-                        track.pipeline.set_property("volume", track.volume)
-                    
+                    self._create_pipeline(row)
                     track.pipeline.set_state(Gst.State.PLAYING)
                     track.playing = True
                     track.paused = False
                     row.set_playing(True)
                     self.playing_tracks.add(row)
-                    
-                    if len(self.playing_tracks) == 1:
-                        GLib.timeout_add(100, self.check_playback_finished)
                 except Exception as e:
                     self.show_error_dialog(f"Failed to play track: {str(e)}")
         
@@ -2827,10 +3251,7 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         track.muted = row.mute_btn.get_active()
         
         if track.pipeline:
-            if track.muted:
-                track.pipeline.set_property("volume", 0.0)
-            else:
-                track.pipeline.set_property("volume", track.volume)
+            track.pipeline.get_by_name("volume").set_property("mute", track.muted)
         
         row.set_muted(track.muted)
         app = self.get_application()
@@ -2844,9 +3265,9 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         # Update tooltip with percentage
         row.volume_scale.set_tooltip_text(f"Track volume: {int(value)}%")
         
-        # Apply volume to pipeline if playing and not muted
-        if track.pipeline and not track.muted:
-            track.pipeline.set_property("volume", track.volume)
+        # Apply volume to pipeline if playing; muting is tracked separately
+        if track.pipeline:
+            track.pipeline.get_by_name("volume").set_property("volume", track.volume)
         
         app = self.get_application()
         app.project_dirty = True
@@ -2884,18 +3305,21 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         track = row.track
         
         if track.recording and track.record_process:
-            track.record_process.terminate()
-            track.record_process.wait()
+            # The file is about to go anyway, so don't wait for pw-record to exit;
+            # Gio.Subprocess reaps it in the background
+            track.record_process.send_signal(signal.SIGTERM)
+            track.record_process = None
+            track.recording = False
         
-        if track.pipeline:
-            track.pipeline.set_state(Gst.State.NULL)
-            track.pipeline = None
+        self._release_pipeline(track)
         track.playing = False
         track.paused = False
         self.playing_tracks.discard(row)
+        self.paused_tracks.discard(row)
         
         if track.temp_file and os.path.exists(track.temp_file):
             os.unlink(track.temp_file)
+        track.has_recording = False
         
         app.tracks.remove(track)
         self.track_list.remove(row)
@@ -2904,82 +3328,107 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
     
     # ==================== Playback ====================
     
-    def check_playback_finished(self):
-        finished_tracks = []
-        for row in list(self.playing_tracks):
-            track = row.track
-            if track.pipeline:
-                _, state, _ = track.pipeline.get_state(0)
-                if state == Gst.State.NULL:
-                    finished_tracks.append(row)
-                else:
-                    bus = track.pipeline.get_bus()
-                    msg = bus.pop_filtered(Gst.MessageType.EOS | Gst.MessageType.ERROR)
-                    if msg:
-                        finished_tracks.append(row)
+    def _create_pipeline(self, row):
+        """Build a playback pipeline for the track and watch its bus for end of playback"""
+        track = row.track
+        if track.pipeline:
+            # A stopped pipeline is parked in NULL and plays again from the
+            # start; filesrc reopens the file, so edits are picked up too
+            if track.pipeline.get_by_name("source").get_property("location") == track.temp_file:
+                return
+            self._release_pipeline(track)
         
-        for row in finished_tracks:
-            track = row.track
-            if track.pipeline:
-                track.pipeline.set_state(Gst.State.NULL)
-                track.pipeline = None
-            track.playing = False
-            track.paused = False
-            row.set_playing(False)
-            self.playing_tracks.discard(row)
+        # Tracks are always WAV, so a fixed chain avoids playbin's autoplugging
+        track.pipeline = Gst.parse_launch(
+            "filesrc name=source ! wavparse ! audioconvert ! audioresample ! "
+            "volume name=volume ! autoaudiosink"
+        )
+        track.pipeline.get_by_name("source").set_property("location", track.temp_file)
+        
+        # Mute through the volume element so the track's level is kept as is
+        volume = track.pipeline.get_by_name("volume")
+        volume.set_property("volume", track.volume)
+        volume.set_property("mute", track.muted)
+        
+        # autoaudiosink only creates the real sink when it starts up
+        track.pipeline.connect("deep-element-added", self._on_playback_element_added)
+        
+        # Bus messages are dispatched from the main loop, so no polling is needed
+        bus = track.pipeline.get_bus()
+        bus.add_signal_watch()
+        bus.connect("message::eos", self.on_playback_finished, row)
+        bus.connect("message::error", self.on_playback_finished, row)
+        bus.connect("message::latency", self.on_playback_latency, row)
+    
+    def _on_playback_element_added(self, pipeline, sub_bin, element):
+        """Shrink the audio sink's ring buffer so playback starts sooner"""
+        # The default 200 ms buffer is mostly start-up delay. Periods stay at
+        # the 10 ms default so the sink doesn't push PipeWire's quantum down.
+        if element.find_property("buffer-time") and element.find_property("latency-time"):
+            element.set_property("buffer-time", 40000)
+            element.set_property("latency-time", 10000)
+    
+    def on_playback_latency(self, bus, message, row):
+        """Redistribute latency when an element's reported latency changes"""
+        # Take the pipeline from the track rather than binding it to its own
+        # bus's handler, which would keep released pipelines alive
+        if row.track.pipeline:
+            row.track.pipeline.recalculate_latency()
+    
+    def _release_pipeline(self, track):
+        """Shut down the track's playback pipeline and remove its bus watch"""
+        if track.pipeline:
+            track.pipeline.set_state(Gst.State.NULL)
+            track.pipeline.get_bus().remove_signal_watch()
+            track.pipeline = None
+    
+    def _park_pipeline(self, track):
+        """Stop the track's pipeline but keep it, with its bus watch, for the next play"""
+        if track.pipeline:
+            # NULL rather than READY, so idle tracks don't hold an audio device
+            track.pipeline.set_state(Gst.State.NULL)
+    
+    def on_playback_finished(self, bus, message, row):
+        track = row.track
+        if message.type == Gst.MessageType.ERROR:
+            self._release_pipeline(track)
+        else:
+            self._park_pipeline(track)
+        track.playing = False
+        track.paused = False
+        row.set_playing(False)
+        self.playing_tracks.discard(row)
+        self.paused_tracks.discard(row)
         
         self.update_global_playback_buttons()
-        return len(self.playing_tracks) > 0
     
     def on_play_all(self, button):
-        app = self.get_application()
-        
         if len(self.playing_tracks) > 0:
             self.pause_all_playback()
             return
         
-        has_paused = any(t.paused for t in app.tracks)
-        
-        if has_paused:
+        if self.paused_tracks:
             self.resume_all_playback()
         else:
             self.start_all_playback()
     
     def start_all_playback(self):
         app = self.get_application()
-        row = self.track_list.get_first_child()
-        started_any = False
-        
-        while row:
-            if isinstance(row, TrackRow):
-                track = row.track
-                if track.temp_file and os.path.exists(track.temp_file) and not track.playing:
-                    try:
-                        if track.pipeline:
-                            track.pipeline.set_state(Gst.State.NULL)
-                            track.pipeline = None
-                        
-                        track.pipeline = Gst.ElementFactory.make("playbin", f"playbin-{track.name}")
-                        track.pipeline.set_property("uri", f"file://{track.temp_file}")
-                        
-                        # Apply volume (0 if muted, otherwise track volume)
-                        if track.muted:
-                            track.pipeline.set_property("volume", 0.0)
-                        else:
-                            track.pipeline.set_property("volume", track.volume)
-                        
-                        track.pipeline.set_state(Gst.State.PLAYING)
-                        track.playing = True
-                        track.paused = False
-                        row.set_playing(True)
-                        self.playing_tracks.add(row)
-                        started_any = True
-                    except Exception as e:
-                        self.show_error_dialog(f"Failed to play track {track.name}: {str(e)}")
-            row = row.get_next_sibling()
-        
-        if started_any:
-            GLib.timeout_add(100, self.check_playback_finished)
+        
+        # app.tracks is in list order, so there's no need to walk the widgets
+        for track in app.tracks:
+            if track.has_recording and not track.playing:
+                row = track.row
+                try:
+                    self._create_pipeline(row)
+                    track.pipeline.set_state(Gst.State.PLAYING)
+                    track.playing = True
+                    track.paused = False
+                    row.set_playing(True)
+                    self.playing_tracks.add(row)
+                    self.paused_tracks.discard(row)
+                except Exception as e:
+                    self.show_error_dialog(f"Failed to play track {track.name}: {str(e)}")
         
         self.update_global_playback_buttons()
     
@@ -2991,65 +3440,55 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
                 track.playing = False
                 track.paused = True
                 row.set_playing(False, paused=True)
+                self.paused_tracks.add(row)
         
         self.playing_tracks.clear()
         self.update_global_playback_buttons()
     
     def resume_all_playback(self):
-        row = self.track_list.get_first_child()
-        resumed_any = False
-        
-        while row:
-            if isinstance(row, TrackRow):
-                track = row.track
-                if track.paused and track.pipeline:
-                    track.pipeline.set_state(Gst.State.PLAYING)
-                    track.playing = True
-                    track.paused = False
-                    row.set_playing(True)
-                    self.playing_tracks.add(row)
-                    resumed_any = True
-            row = row.get_next_sibling()
-        
-        if resumed_any:
-            GLib.timeout_add(100, self.check_playback_finished)
+        for row in list(self.paused_tracks):
+            track = row.track
+            if track.pipeline:
+                track.pipeline.set_state(Gst.State.PLAYING)
+                track.playing = True
+                track.paused = False
+                row.set_playing(True)
+                self.playing_tracks.add(row)
         
+        self.paused_tracks.clear()
         self.update_global_playback_buttons()
     
     def on_stop_all(self, button):
         self.stop_all_playback()
     
     def stop_all_playback(self):
-        for row in list(self.playing_tracks):
+        # A row is in at most one of the two sets
+        for row in self.playing_tracks | self.paused_tracks:
             track = row.track
-            if track.pipeline:
-                track.pipeline.set_state(Gst.State.NULL)
-                track.pipeline = None
+            self._park_pipeline(track)
             track.playing = False
             track.paused = False
             row.set_playing(False)
         
         self.playing_tracks.clear()
-        
-        row = self.track_list.get_first_child()
-        while row:
-            if isinstance(row, TrackRow):
-                track = row.track
-                if track.paused and track.pipeline:
-                    track.pipeline.set_state(Gst.State.NULL)
-                    track.pipeline = None
-                    track.paused = False
-                    row.set_playing(False)
-            row = row.get_next_sibling()
-        
+        self.paused_tracks.clear()
         self.update_global_playback_buttons()
     
     def update_global_playback_buttons(self):
+        # EOS for many tracks, or a batch like Play All, can land in a single
+        # main loop iteration; refresh the buttons once after all of them
+        if not self._buttons_refresh_pending:
+            self._buttons_refresh_pending = True
+            GLib.idle_add(self._refresh_global_playback_buttons)
+    
+    def _refresh_global_playback_buttons(self):
+        """Update the play all and stop all buttons from the current track states"""
+        self._buttons_refresh_pending = False
         app = self.get_application()
         
-        has_recordings = any(t.temp_file and os.path.exists(t.temp_file) for t in app.tracks)
+        has_recordings = any(t.has_recording for t in app.tracks)
         any_playing = len(self.playing_tracks) > 0
-        any_paused = any(t.paused for t in app.tracks)
+        any_paused = len(self.paused_tracks) > 0
         
         if any_playing:
             self.play_all_btn.set_icon_name("media-playback-pause-symbolic")
@@ -3063,13 +3502,16 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         
         self.play_all_btn.set_sensitive(has_recordings or any_paused)
         self.stop_all_btn.set_sensitive(any_playing or any_paused)
+        return False
     
     def update_export_buttons(self):
         app = self.get_application()
-        has_recordings = any(t.temp_file and os.path.exists(t.temp_file) for t in app.tracks)
-        self.export_tracks_action.set_enabled(has_recordings)
-        self.export_mixed_action.set_enabled(has_recordings)
-        self.export_all_action.set_enabled(has_recordings)
+        can_export = any(t.has_recording for t in app.tracks) and not self.mixing
+        if can_export != self._export_enabled:
+            self._export_enabled = can_export
+            self.export_tracks_action.set_enabled(can_export)
+            self.export_mixed_action.set_enabled(can_export)
+            self.export_all_action.set_enabled(can_export)
         self.update_global_playback_buttons()
     
     # ==================== Monitoring ====================
@@ -3105,23 +3547,21 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
             return
         
         try:
-            monitor_record = subprocess.Popen([
-                'pw-record', '--target', 'auto', '--latency', self.monitor_latency,
-                '--rate', '48000', '-'
-            ], stdout=subprocess.PIPE)
-            
-            monitor_play = subprocess.Popen([
-                'pw-play', '--target', 'auto', '--latency', self.monitor_latency,
-                '--rate', '48000', '-'
-            ], stdin=monitor_record.stdout)
-            
-            monitor_record.stdout.close()
-            
-            app.monitor_process = (monitor_record, monitor_play)
+            # pw-loopback links the default source to the default sink inside
+            # PipeWire, so no audio passes through a pipe or this process.
+            # node.latency keeps the latency in samples, as the menu offers it.
+            latency = f"node.latency={self.monitor_latency}/48000"
+            # posix_spawn (vfork) avoids forking this whole process, and a
+            # bare pid needs none of Popen's bookkeeping. Python ignores
+            # SIGPIPE and SIGXFSZ, so reset them as subprocess would.
+            pid = os.posix_spawn(self.pw_loopback, [
+                self.pw_loopback, '--channels', '2',
+                '--capture-props', latency, '--playback-props', latency
+            ], os.environ, setsigdef=(signal.SIGPIPE, signal.SIGXFSZ))
+            # GLib reaps the process whenever it exits, including on its own
+            GLib.child_watch_add(GLib.PRIORITY_DEFAULT, pid, self.on_monitor_exited)
+            app.monitor_process = pid
             app.monitoring = True
-        except FileNotFoundError:
-            self.show_error_dialog("PipeWire tools not found for monitoring.")
-            self.monitor_toggle.set_active(False)
         except Exception as e:
             self.show_error_dialog(f"Failed to start monitoring: {str(e)}")
             self.monitor_toggle.set_active(False)
@@ -3130,80 +3570,42 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         app = self.get_application()
         
         if app.monitoring and app.monitor_process:
-            record_proc, play_proc = app.monitor_process
-            
-            # Terminate both processes
+            # The child watch set up in start_monitoring reaps it, so don't
+            # block here waiting for it to exit
             try:
-                record_proc.terminate()
-            except:
-                pass
-            try:
-                play_proc.terminate()
-            except:
+                os.kill(app.monitor_process, signal.SIGTERM)
+            except OSError:
                 pass
             
-            # Wait for them to finish
-            try:
-                record_proc.wait(timeout=2)
-            except:
-                try:
-                    record_proc.kill()
-                    record_proc.wait(timeout=1)
-                except:
-                    pass
-            
-            try:
-                play_proc.wait(timeout=2)
-            except:
-                try:
-                    play_proc.kill()
-                    play_proc.wait(timeout=1)
-                except:
-                    pass
-            
             app.monitor_process = None
             app.monitoring = False
     
+    def on_monitor_exited(self, pid, status):
+        app = self.get_application()
+        
+        if app.monitor_process == pid:
+            # pw-loopback quit on its own, e.g. because PipeWire restarted
+            app.monitor_process = None
+            app.monitoring = False
+            self.monitor_toggle.set_active(False)
+    
     # ==================== Help & About ====================
     
     def on_show_shortcuts(self, action, param):
-        shortcuts_window = Gtk.ShortcutsWindow(transient_for=self, modal=True)
+        # The window's contents never change, so it is built once and hidden
+        # rather than destroyed when closed
+        if self._shortcuts_window is None:
+            self._shortcuts_window = self._build_shortcuts_window()
+        self._shortcuts_window.present()
+    
+    def _build_shortcuts_window(self):
+        """Build the keyboard shortcuts window from SHORTCUT_GROUPS"""
+        shortcuts_window = Gtk.ShortcutsWindow(transient_for=self, modal=True, hide_on_close=True)
         
         section = Gtk.ShortcutsSection(section_name="shortcuts", title="Shortcuts")
         section.set_visible(True)
         
-        groups_data = [
-            ("Project", [
-                ("New Project", "<Control>n"),
-                ("Open Project", "<Control>o"),
-                ("Save Project", "<Control>s"),
-                ("Save Project As", "<Control><Shift>s"),
-            ]),
-            ("Tracks", [
-                ("Add Track", "<Control>t"),
-                ("Import Audio", "<Control>i"),
-            ]),
-            ("Playback", [
-                ("Play / Pause All", "<Control>space"),
-                ("Stop All", "<Control>period"),
-                ("Toggle Monitoring", "<Control>l"),
-            ]),
-            ("Tools", [
-                ("Chromatic Tuner", "<Control>u"),
-                ("Drum Machine", "<Control>d"),
-            ]),
-            ("Export", [
-                ("Export Tracks", "<Control><Shift>t"),
-                ("Export Mixed", "<Control><Shift>x"),
-                ("Export All", "<Control><Shift>a"),
-            ]),
-            ("Help", [
-                ("Help", "F1"),
-                ("Keyboard Shortcuts", "<Control>question"),
-            ]),
-        ]
-        
-        for group_title, shortcuts in groups_data:
+        for group_title, shortcuts in SHORTCUT_GROUPS:
             group = Gtk.ShortcutsGroup(title=group_title)
             group.set_visible(True)
             for title, accel in shortcuts:
@@ -3213,7 +3615,7 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
             section.append(group)
         
         shortcuts_window.add_section(section)
-        shortcuts_window.present()
+        return shortcuts_window
     
     def on_show_tuner(self, action, param):
         """Open the chromatic tuner dialog"""
@@ -3296,11 +3698,34 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
     # ==================== Dialogs ====================
     
     def show_error_dialog(self, message):
-        dialog = Adw.AlertDialog(heading="Error", body=message)
+        # Errors raised in the same main loop iteration (one per track when
+        # a batch operation fails) are shown together in a single dialog
+        if message in self._pending_errors:
+            return
+        if not self._pending_errors:
+            GLib.idle_add(self._flush_error_dialog)
+        self._pending_errors.append(message)
+    
+    def _flush_error_dialog(self):
+        """Show every error queued by show_error_dialog in one dialog"""
+        messages = self._pending_errors
+        self._pending_errors = []
+        if len(messages) == 1:
+            body = messages[0]
+        else:
+            body = "\n".join(f"• {message}" for message in messages)
+        dialog = Adw.AlertDialog(heading="Error", body=body)
         dialog.add_response("ok", "OK")
         dialog.present(self)
+        return False
     
     def on_close_request(self, window):
+        if self.mixing:
+            # Closing now would kill the worker mid-write and leave a partial
+            # file in the export folder; close once it's done instead
+            self._close_after_mix = True
+            self.status_label.set_label("Closing once the export has finished…")
+            return True
         if self.has_unsaved_changes():
             self.show_close_confirmation_dialog()
             return True
@@ -3318,22 +3743,34 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         # Stop all playback
         self.stop_all_playback()
         
-        # Stop all recording processes and clean up GStreamer pipelines
-        for track in app.tracks:
-            # Stop recording
-            if track.recording and track.record_process:
+        # Let a running export finish writing before the session directory goes
+        if self._mix_thread:
+            self._mix_thread.join()
+        
+        # Signal every pw-record first so they all finish their WAV headers
+        # at once, then share one two-second deadline between them
+        recording = [t for t in app.tracks if t.recording and t.record_process]
+        for track in recording:
+            track.record_process.send_signal(signal.SIGTERM)
+        
+        if recording:
+            cancellable = Gio.Cancellable()
+            timer = threading.Timer(2, cancellable.cancel)
+            timer.start()
+            for track in recording:
                 try:
-                    track.record_process.terminate()
-                    track.record_process.wait(timeout=2)
-                except:
-                    try:
-                        track.record_process.kill()
-                    except:
-                        pass
+                    track.record_process.wait(cancellable)
+                except GLib.Error:
+                    track.record_process.force_exit()
                 track.record_process = None
                 track.recording = False
-            
-            # Clean up GStreamer pipeline
+                # Finished takes count as recordings, so a save after this
+                # keeps them
+                track.has_recording = os.path.exists(track.temp_file)
+            timer.cancel()
+        
+        # Clean up GStreamer pipelines
+        for track in app.tracks:
             if track.pipeline:
                 try:
                     track.pipeline.set_state(Gst.State.NULL)
@@ -3362,8 +3799,9 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         if response == "save":
             app = self.get_application()
             if app.project_file:
-                self.save_project(app.project_file)
+                # Finish any takes still recording first so the save includes them
                 self.cleanup_all_processes()
+                self.save_project(app.project_file)
                 self.destroy()
             else:
                 self.pending_close = True
@@ -3379,15 +3817,14 @@ class AudioRecorderWindow(Adw.ApplicationWindow):
         try:
             file = dialog.save_finish(result)
             if file:
-                self.save_project(file.get_path())
                 self.cleanup_all_processes()
+                self.save_project(file.get_path())
                 self.destroy()
         except Exception as e:
             if "dismissed" not in str(e).lower():
                 self.show_error_dialog(f"Failed to save project: {str(e)}")
         finally:
-            if hasattr(self, 'pending_close'):
-                delattr(self, 'pending_close')
+            self.pending_close = False
 
 
 def main():